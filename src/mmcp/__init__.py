@@ -1,34 +1,134 @@
-import json
-import subprocess
+import os
+import re
 import sys
+from functools import cache, cached_property, lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import click
-import toml
-from packaging.version import parse
+
+if TYPE_CHECKING:
+    from jinja2 import Environment, Template
+
+# Heavier dependencies (jinja2, tomllib, tomli_w, orjson/json, subprocess,
+# shutil) are imported where they are used to keep `mmcp --help` fast.
 
 MIN_UV_VERSION = "0.4.10"
 
+# The mcp dependency added to new projects, as a Poetry constraint for
+# [tool.poetry.dependencies] and as a PEP 508 requirement for [project]
+MCP_DEPENDENCY = "^1.1.2"
+MCP_REQUIREMENT = "mcp>=1.1.2,<2"
+
+# Tool files that are always copied, even without --with-examples
+CORE_TOOL_FILES = ("__init__.py", "base.py")
+
+# A template without any of these has nothing for Jinja to render
+JINJA_MARKERS = (b"{{", b"{%", b"{#")
+
+# Valid project names start and end with an ASCII letter or digit and may
+# contain underscores, hyphens and periods in between
+_PACKAGE_NAME_RE = re.compile(r"[A-Za-z0-9](?:[A-Za-z0-9._-]*[A-Za-z0-9])?")
+_PACKAGE_NAME_CHARS_RE = re.compile(r"[A-Za-z0-9._-]+")
+
+TEMPLATE_DIR = Path(__file__).parent / "template"
+
+_TEMPLATES: dict[str, "Template"] = {}
+
+
+@cache
+def _template_subdirs() -> frozenset[str]:
+    """Names of the subdirectories shipped in the template directory"""
+    try:
+        with os.scandir(TEMPLATE_DIR) as entries:
+            return frozenset(entry.name for entry in entries if entry.is_dir())
+    except FileNotFoundError:
+        return frozenset()
+
+
+@cache
+def _get_env() -> "Environment":
+    """Create the Jinja2 environment shared by every render"""
+    from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+    # Templates ship with the package and never change at runtime. The
+    # bytecode cache lives in a per-user temp directory so compiled
+    # templates survive between runs.
+    return Environment(
+        loader=FileSystemLoader(str(TEMPLATE_DIR)),
+        auto_reload=False,
+        bytecode_cache=FileSystemBytecodeCache(),
+    )
+
+
+def _get_template(name: str) -> "Template":
+    """Return the compiled template, compiling it at most once per process"""
+    template = _TEMPLATES.get(name)
+    if template is None:
+        template = _TEMPLATES[name] = _get_env().get_template(name)
+    return template
+
+
+def is_debug() -> bool:
+    """Check if debug output was requested via the MMCP_DEBUG environment variable"""
+    return bool(os.environ.get("MMCP_DEBUG"))
+
 
 class PyProject:
     def __init__(self, path: Path):
-        self.data = toml.load(path)
+        if sys.version_info >= (3, 11):
+            import tomllib
+        else:
+            import tomli as tomllib
+
+        with open(path, "rb") as f:
+            self.data = tomllib.load(f)
 
-    @property
+    @cached_property
+    def _table(self) -> dict:
+        poetry = self.data.get("tool", {}).get("poetry")
+        return self.data["project"] if poetry is None else poetry
+
+    @cached_property
     def name(self) -> str:
-        if "tool" in self.data and "poetry" in self.data["tool"]:
-            return self.data["tool"]["poetry"]["name"]
-        return self.data["project"]["name"]
+        return self._table["name"]
 
-    @property
+    @cached_property
     def first_binary(self) -> str | None:
-        if "tool" in self.data and "poetry" in self.data["tool"]:
-            scripts = self.data["tool"]["poetry"].get("scripts", {})
-        else:
-            scripts = self.data["project"].get("scripts", {})
-        return next(iter(scripts.keys()), None)
+        return next(iter(self._table.get("scripts") or {}), None)
+
+
+def _json_loads(data: bytes) -> dict:
+    try:
+        import orjson  # optional speedup, see the "speedups" extra
+    except ImportError:
+        import json
+
+        return json.loads(data)
+    return orjson.loads(data)
+
+
+def _json_dumps(obj: dict) -> bytes:
+    try:
+        import orjson
+    except ImportError:
+        import json
+
+        return json.dumps(obj, indent=2).encode()
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
 
+@lru_cache(maxsize=8)
+def _load_pyproject(path_str: str) -> PyProject:
+    return PyProject(Path(path_str))
 
+
+def load_pyproject(path: Path) -> PyProject:
+    """Load a pyproject.toml, parsing each file at most once until it is rewritten"""
+    return _load_pyproject(str(path.resolve()))
+
+
+@cache
 def get_claude_config_path() -> Path | None:
     """Get the Claude config directory based on platform"""
     if sys.platform == "win32":
@@ -43,6 +143,7 @@ def get_claude_config_path() -> Path | None:
     return None
 
 
+@cache
 def has_claude_app() -> bool:
     return get_claude_config_path() is not None
 
@@ -58,7 +159,7 @@ def update_claude_config(project_name: str, project_path: Path) -> bool:
         return False
 
     try:
-        config = json.loads(config_file.read_text())
+        config = _json_loads(config_file.read_bytes())
         if "mcpServers" not in config:
             config["mcpServers"] = {}
 
@@ -75,7 +176,7 @@ def update_claude_config(project_name: str, project_path: Path) -> bool:
             "args": ["run", project_name],
         }
 
-        config_file.write_text(json.dumps(config, indent=2))
+        config_file.write_bytes(_json_dumps(config))
         click.echo(f"✅ Added {project_name} to Claude.app configuration")
         click.echo(f"Settings file location: {config_file}")
         return True
@@ -87,45 +188,25 @@ def update_claude_config(project_name: str, project_path: Path) -> bool:
 
 def get_package_directory(path: Path) -> Path:
     """Find the package directory under src/"""
-    src_dir = next((path / "src").glob("*/__init__.py"), None)
-    if src_dir is None:
-        click.echo("❌ Error: Could not find __init__.py in src directory", err=True)
-        sys.exit(1)
-    return src_dir.parent
-
-
-def copy_template(
-    path: Path, 
-    name: str, 
-    description: str, 
-    version: str = "0.1.0",
-    with_examples: bool = False
-) -> None:
-    """Copy template files into src/<project_name>"""
-    template_dir = Path(__file__).parent / "template"
-    tools_dir = template_dir / "tools"
-    services_dir = template_dir / "services"
-    target_dir = get_package_directory(path)
-
-    # Create required directories first
-    (target_dir / "prompts").mkdir(parents=True, exist_ok=True)
-    (target_dir / "resources").mkdir(parents=True, exist_ok=True)
-    (target_dir / "tools").mkdir(parents=True, exist_ok=True)
-    (target_dir / "services").mkdir(parents=True, exist_ok=True)
-
-    # Add debug output
-    click.echo(f"Template directory: {template_dir}")
-    click.echo(f"Template directory exists: {template_dir.exists()}")
-    click.echo(f"Files in template directory: {list(template_dir.glob('*'))}")
-    click.echo(f"Files in services directory: {list(services_dir.glob('*'))}")
-
-    from jinja2 import Environment, FileSystemLoader
-
-    env = Environment(loader=FileSystemLoader(str(template_dir)))
-
-    # Debug template loading
-    click.echo(f"Available templates: {env.list_templates()}")
-
+    try:
+        with os.scandir(path / "src") as entries:
+            for entry in entries:
+                if entry.is_dir() and os.path.isfile(os.path.join(entry.path, "__init__.py")):
+                    return Path(entry.path)
+    except FileNotFoundError:
+        pass
+    click.echo("❌ Error: Could not find __init__.py in src directory", err=True)
+    sys.exit(1)
+
+
+def _build_manifest(
+    path: Path, target_dir: Path, with_examples: bool
+) -> tuple[list[tuple[str, Path, bool]], list[Path]]:
+    """List the (template_name, dest_path, is_template) entries of a scaffold
+
+    Also returns the nested output directories those entries need, beyond
+    the top-level ones copy_template always creates.
+    """
     # Main template files
     files = [
         ("server.py.jinja2", "server.py", target_dir),
@@ -139,9 +220,107 @@ def copy_template(
         # ("resources/__init__.py.jinja2", "resources/__init__.py", target_dir),
         # ("resources/core.py.jinja2", "resources/core.py", target_dir),
     ]
+    manifest = [
+        (template_file, output_dir / output_file, True)
+        for template_file, output_file, output_dir in files
+    ]
+    directories = []
+
+    # Example tools are only copied when requested. tools/ and services/
+    # are flat, while tests/ is copied recursively.
+    subdirs = [
+        ("tools", target_dir / "tools", None if with_examples else CORE_TOOL_FILES, False),
+        ("services", target_dir / "services", None, False),
+        ("tests", path / "tests", None, True),
+    ]
+    subdirs_present = _template_subdirs()
+    for subdir, output_dir, only, recursive in subdirs:
+        if subdir not in subdirs_present:
+            continue
+
+        pending = [(subdir, output_dir)]
+        while pending:
+            source_dir, dest_dir = pending.pop()
+            with os.scandir(TEMPLATE_DIR / source_dir) as entries:
+                for entry in entries:
+                    # Filter on the name before touching the entry's file type
+                    if only is not None and entry.name not in only:
+                        continue
+                    template_name = f"{source_dir}/{entry.name}"
+                    if entry.is_dir():
+                        if recursive and entry.name != "__pycache__":
+                            directories.append(dest_dir / entry.name)
+                            pending.append((template_name, dest_dir / entry.name))
+                        continue
+                    if not entry.is_file():
+                        continue
+                    if entry.name.endswith(".jinja2"):
+                        # Remove .jinja2 extension
+                        out_path = dest_dir / entry.name[: -len(".jinja2")]
+                        manifest.append((template_name, out_path, True))
+                    else:
+                        out_path = dest_dir / entry.name
+                        manifest.append((template_name, out_path, False))
+    return manifest, directories
+
+
+@cache
+def _plain_template_source(template_name: str) -> bytes | None:
+    """Return the source of a template without Jinja markers, otherwise None"""
+    source = (TEMPLATE_DIR / template_name).read_bytes()
+    if any(marker in source for marker in JINJA_MARKERS):
+        return None
+    return source
+
+
+def _render_template(template_name: str, template_vars: dict) -> bytes:
+    """Render a template to UTF-8 bytes"""
+    # .jinja2 files always go to Jinja, so only other files such as .env
+    # are read up front to see whether there is anything to render
+    if not template_name.endswith(".jinja2"):
+        source = _plain_template_source(template_name)
+        if source is not None:
+            return source
+    return _get_template(template_name).render(**template_vars).encode()
+
+
+def copy_template(
+    path: Path, 
+    name: str, 
+    description: str, 
+    version: str = "0.1.0",
+    with_examples: bool = False
+) -> None:
+    """Copy template files into src/<project_name>"""
+    import shutil
+    from concurrent.futures import ThreadPoolExecutor
+
+    template_dir = TEMPLATE_DIR
+    subdirs_present = _template_subdirs()
+    target_dir = get_package_directory(path)
+
+    # Create required directories first
+    for subdir in ("prompts", "resources", "tools", "services"):
+        os.makedirs(target_dir / subdir, exist_ok=True)
+    os.makedirs(path / "tests", exist_ok=True)
+
+    # Debug output, only when requested via MMCP_DEBUG
+    if is_debug():
+        click.echo(f"Template directory: {template_dir}")
+        click.echo(f"Template subdirectories: {sorted(subdirs_present)}")
+        click.echo("Files in template directory:")
+        with os.scandir(template_dir) as entries:
+            for entry in entries:
+                click.echo(f"  {entry.name}")
+        if "services" in subdirs_present:
+            click.echo("Files in services directory:")
+            with os.scandir(template_dir / "services") as entries:
+                for entry in entries:
+                    click.echo(f"  {entry.name}")
+        click.echo(f"Available templates: {_get_env().list_templates()}")
 
     # pyproject.toml
-    pyproject = PyProject(path / "pyproject.toml")
+    pyproject = load_pyproject(path / "pyproject.toml")
     bin_name = pyproject.first_binary
 
     # template variables
@@ -155,79 +334,67 @@ def copy_template(
     }
 
     try:
-        # Copy main template files in the tools, prompts, and resources directories
-        for template_file, output_file, output_dir in files:
-            template = env.get_template(template_file)
-            rendered = template.render(**template_vars)
-
-            out_path = output_dir / output_file
-            out_path.write_text(rendered)
-
-        # Set up tools directory
-        if tools_dir.exists():
-            tools_target = target_dir / "tools"
-            tools_target.mkdir(exist_ok=True)
-            
-            # Always copy core files
-            core_files = ['__init__.py', 'base.py']
-            for filename in core_files:
-                tool_file = tools_dir / filename
-                if tool_file.exists():
-                    # Copy non-template files directly
-                    import shutil
-                    shutil.copy2(tool_file, tools_target / filename)
-
-            if with_examples:
-                # Copy additional example files when requested
-                for tool_file in tools_dir.glob("*"):
-                    if tool_file.is_file() and tool_file.name not in core_files:
-                        if tool_file.suffix == '.jinja2':
-                            # Handle template files
-                            template = env.get_template(f"tools/{tool_file.name}")
-                            rendered = template.render(**template_vars)
-                            out_path = tools_target / tool_file.stem  # Remove .jinja2 extension
-                            out_path.write_text(rendered)
-                        else:
-                            # Copy non-template files directly
-                            import shutil
-                            shutil.copy2(tool_file, tools_target / tool_file.name)
-
-        # Set up services directory
-        if services_dir.exists():
-            services_target = target_dir / "services"
-            services_target.mkdir(exist_ok=True)
-            
-            # Copy all service files
-            for service_file in services_dir.glob("*"):
-                if service_file.is_file():
-                    if service_file.suffix == '.jinja2':
-                        # Handle template files
-                        template = env.get_template(f"services/{service_file.name}")
-                        rendered = template.render(**template_vars)
-                        out_path = services_target / service_file.stem  # Remove .jinja2 extension
-                        out_path.write_text(rendered)
-                    else:
-                        # Copy non-template files directly
-                        import shutil
-                        shutil.copy2(service_file, services_target / service_file.name)
-
-        # Set up tests directory
-        template_tests_dir = template_dir / "tests"
-        if template_tests_dir.exists():
-            tests_target = path / "tests"
-            shutil.copytree(template_tests_dir, tests_target, dirs_exist_ok=True)
+        # The default scaffold ships prerendered, see mmcp.bundle
+        if not with_examples:
+            from .bundle import extract_template_bundle
+
+            if extract_template_bundle(path, target_dir, template_vars):
+                return
+
+        # Collect every file to write up front, then render/copy in one pass
+        manifest, directories = _build_manifest(path, target_dir, with_examples)
+        for directory in directories:
+            os.makedirs(directory, exist_ok=True)
+
+        def write_entry(entry: tuple[str, Path, bool]) -> None:
+            template_name, out_path, is_template = entry
+            if is_template:
+                out_path.write_bytes(_render_template(template_name, template_vars))
+            else:
+                # Copy non-template files directly
+                shutil.copyfile(template_dir / template_name, out_path)
+
+        # Build the environment up front so the workers share a single one
+        _get_env()
+        with ThreadPoolExecutor(max_workers=min(8, len(manifest))) as executor:
+            # Consume the results so worker exceptions propagate
+            list(executor.map(write_entry, manifest))
 
     except Exception as e:
         click.echo(f"❌ Error: Failed to template and write files: {e}", err=True)
         sys.exit(1)
 
 
+def _update_project_table(
+    project: dict, version: str | None, description: str | None
+) -> None:
+    """Set version, description and the mcp dependency in a PEP 621 table"""
+    from packaging.requirements import Requirement
+    from packaging.utils import canonicalize_name
+
+    if version is not None:
+        project["version"] = version
+    if description is not None:
+        project["description"] = description
+
+    dependencies = project.setdefault("dependencies", [])
+    if not any(
+        canonicalize_name(Requirement(dependency).name) == "mcp"
+        for dependency in dependencies
+    ):
+        dependencies.append(MCP_REQUIREMENT)
+
+
 def create_project(
     path: Path, name: str, description: str, version: str, use_claude: bool = True, with_examples: bool = False) -> None:
     """Create a new project using Poetry"""
+    import subprocess
+
     path.mkdir(parents=True, exist_ok=True)
 
     try:
+        import tomli_w
+
         # Initialize new Poetry project
         subprocess.run(
             ["poetry", "new", "--src", "--name", name, "."],
@@ -235,27 +402,30 @@ def create_project(
             check=True,
         )
 
-        # Add mcp dependency using Poetry
-        subprocess.run(
-            ["poetry", "add", "mcp^1.1.2"],
-            cwd=path,
-            check=True,
-        )
-
-        # Update pyproject.toml with additional settings
+        # Update pyproject.toml in a single pass instead of running
+        # `poetry add`, which would resolve and lock dependencies as well.
+        # Poetry just wrote the file, so drop any copy parsed before it existed.
+        _load_pyproject.cache_clear()
         pyproject_path = path / "pyproject.toml"
         if pyproject_path.exists():
-            with open(pyproject_path) as f:
-                pyproject = toml.load(f)
-            
-            # Ensure mcp dependency exists
-            if "dependencies" not in pyproject["tool"]["poetry"]:
-                pyproject["tool"]["poetry"]["dependencies"] = {}
-            
-            pyproject["tool"]["poetry"]["dependencies"]["mcp"] = "^1.1.2"
-            
-            with open(pyproject_path, "w") as f:
-                toml.dump(pyproject, f)
+            pyproject = load_pyproject(pyproject_path).data
+
+            if is_debug():
+                click.echo(f"Current pyproject.toml content: {pyproject}")
+
+            if "project" in pyproject:
+                # Poetry >= 2 writes PEP 621 metadata under [project]
+                _update_project_table(pyproject["project"], version, description)
+            else:
+                poetry = pyproject.setdefault("tool", {}).setdefault("poetry", {})
+                if version is not None:
+                    poetry["version"] = version
+                if description is not None:
+                    poetry["description"] = description
+                poetry.setdefault("dependencies", {})["mcp"] = MCP_DEPENDENCY
+
+            # The cached copy was updated in place and now matches the file
+            pyproject_path.write_bytes(tomli_w.dumps(pyproject).encode())
 
     except subprocess.CalledProcessError as e:
         click.echo(f"❌ Error: Failed to initialize Poetry project: {e}", err=True)
@@ -278,42 +448,6 @@ def create_project(
         update_claude_config(name, path)
 
 
-def update_pyproject_settings(
-    project_path: Path, version: str, description: str
-) -> None:
-    """Update project version and description in pyproject.toml"""
-    import toml
-
-    pyproject_path = project_path / "pyproject.toml"
-
-    if not pyproject_path.exists():
-        click.echo("❌ Error: pyproject.toml not found", err=True)
-        sys.exit(1)
-
-    try:
-        pyproject = toml.load(pyproject_path)
-        
-        # Add debug output
-        click.echo(f"Current pyproject.toml content: {pyproject}")
-
-        if "tool" not in pyproject:
-            pyproject["tool"] = {}
-        if "poetry" not in pyproject["tool"]:
-            pyproject["tool"]["poetry"] = {}
-
-        if version is not None:
-            pyproject["tool"]["poetry"]["version"] = version
-
-        if description is not None:
-            pyproject["tool"]["poetry"]["description"] = description
-
-        pyproject_path.write_text(toml.dumps(pyproject))
-
-    except Exception as e:
-        click.echo(f"❌ Error updating pyproject.toml: {e}", err=True)
-        sys.exit(1)
-
-
 def check_package_name(name: str) -> bool:
     """Check if the package name is valid according to pyproject.toml spec"""
     if not name:
@@ -322,30 +456,27 @@ def check_package_name(name: str) -> bool:
     if " " in name:
         click.echo("❌ Project name must not contain spaces", err=True)
         return False
-    if not all(c.isascii() and (c.isalnum() or c in "_-.") for c in name):
+    if _PACKAGE_NAME_RE.fullmatch(name) is not None:
+        return True
+    if _PACKAGE_NAME_CHARS_RE.fullmatch(name) is None:
         click.echo(
             "❌ Project name must consist of ASCII letters, digits, underscores, hyphens, and periods",
             err=True,
         )
         return False
-    if name.startswith(("_", "-", ".")) or name.endswith(("_", "-", ".")):
-        click.echo(
-            "❌ Project name must not start or end with an underscore, hyphen, or period",
-            err=True,
-        )
-        return False
-    return True
+    click.echo(
+        "❌ Project name must not start or end with an underscore, hyphen, or period",
+        err=True,
+    )
+    return False
 
 
+@cache
 def check_poetry_version() -> str | None:
-    """Check if Poetry is installed"""
-    try:
-        result = subprocess.run(
-            ["poetry", "--version"], capture_output=True, text=True, check=True
-        )
-        return result.stdout.strip()
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return None
+    """Check if Poetry is installed, returning the path to its executable"""
+    import shutil
+
+    return shutil.which("poetry")
 
 
 def ensure_poetry_installed() -> None:
@@ -356,14 +487,9 @@ def ensure_poetry_installed() -> None:
         sys.exit(1)
 
 
+@cache
 def check_docker_available() -> bool:
     """Check if Docker is available"""
-    try:
-        subprocess.run(
-            ["docker", "--version"], 
-            capture_output=True, 
-            check=True
-        )
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return False
+    import shutil
+
+    return shutil.which("docker") is not None
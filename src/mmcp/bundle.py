@@ -0,0 +1,134 @@
+"""Prerendered template bundle for the default (no examples) scaffold.
+
+The templates are rendered once with sentinel values in place of the
+template variables and stored in template_precompiled.zip, together with a
+digest of the template sources. Creating a project then only has to replace
+the sentinels, without loading Jinja2. A bundle whose digest no longer
+matches the templates is ignored and the project is rendered as usual.
+
+Rebuild the bundle after changing anything under template/:
+
+    python -m mmcp.bundle
+"""
+import hashlib
+import zipfile
+from pathlib import Path
+
+BUNDLE_PATH = Path(__file__).parent / "template_precompiled.zip"
+
+# Destinations inside the bundle are relative to one of these roots
+_PROJECT_ROOT = "project"
+_PACKAGE_ROOT = "package"
+
+# Template variables that may be substituted into the prerendered files
+BUNDLE_VARIABLES = (
+    "binary_name",
+    "server_name",
+    "server_version",
+    "server_description",
+    "server_directory",
+)
+
+# Fixed timestamp so rebuilding unchanged templates produces the same zip
+_ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+def _sentinel(variable: str) -> str:
+    return f"__MMCP_{variable.upper()}__"
+
+
+def _template_digest(manifest: list[tuple[str, Path, bool]]) -> str:
+    """Hash the names, destinations and sources of the bundled templates"""
+    from . import TEMPLATE_DIR
+
+    digest = hashlib.sha256()
+    for template_name, out_path, _ in sorted(manifest):
+        digest.update(f"{template_name}\0{out_path.as_posix()}\0".encode())
+        digest.update((TEMPLATE_DIR / template_name).read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def build_template_bundle(bundle_path: Path = BUNDLE_PATH) -> Path:
+    """Render the no-examples scaffold into the zip bundle"""
+    from . import TEMPLATE_DIR, _build_manifest, _render_template
+
+    manifest, directories = _build_manifest(Path(_PROJECT_ROOT), Path(_PACKAGE_ROOT), False)
+    sentinel_vars = {variable: _sentinel(variable) for variable in BUNDLE_VARIABLES}
+    sample_vars = {variable: f"sample-{variable}" for variable in BUNDLE_VARIABLES}
+
+    files = {}
+    for template_name, out_path, is_template in manifest:
+        if not is_template:
+            files[out_path.as_posix()] = (TEMPLATE_DIR / template_name).read_bytes()
+            continue
+
+        rendered = _render_template(template_name, {**sentinel_vars, "with_examples": False})
+        # Plain substitution must match a real render, which rules out
+        # variables passed through filters or used in conditions
+        expected = _render_template(template_name, {**sample_vars, "with_examples": False})
+        substituted = rendered
+        for variable in BUNDLE_VARIABLES:
+            substituted = substituted.replace(
+                sentinel_vars[variable].encode(), sample_vars[variable].encode()
+            )
+        if substituted != expected:
+            raise ValueError(f"{template_name} cannot be prerendered")
+        files[out_path.as_posix()] = rendered
+
+    used = [
+        variable
+        for variable in BUNDLE_VARIABLES
+        if any(sentinel_vars[variable].encode() in data for data in files.values())
+    ]
+    with zipfile.ZipFile(bundle_path, "w", zipfile.ZIP_DEFLATED) as bundle:
+        # The first line is the source digest, the second the variables used
+        bundle.comment = f"{_template_digest(manifest)}\n{','.join(used)}".encode()
+        # Nested directories come first so extraction can create them in order
+        for directory in directories:
+            bundle.writestr(zipfile.ZipInfo(f"{directory.as_posix()}/", _ZIP_DATE_TIME), b"")
+        for name in sorted(files):
+            info = zipfile.ZipInfo(name, _ZIP_DATE_TIME)
+            bundle.writestr(info, files[name], compress_type=zipfile.ZIP_DEFLATED)
+    return bundle_path
+
+
+def extract_template_bundle(
+    path: Path, target_dir: Path, template_vars: dict, bundle_path: Path = BUNDLE_PATH
+) -> bool:
+    """Write the prerendered scaffold, returning False if it cannot be used"""
+    from . import _build_manifest
+
+    if template_vars.get("with_examples") or not bundle_path.is_file():
+        return False
+
+    with zipfile.ZipFile(bundle_path) as bundle:
+        digest, _, used = bundle.comment.decode().partition("\n")
+        # Templates changed since the bundle was built
+        manifest, _ = _build_manifest(Path(_PROJECT_ROOT), Path(_PACKAGE_ROOT), False)
+        if digest != _template_digest(manifest):
+            return False
+        used = used.split(",") if used else []
+        values = [template_vars.get(variable) for variable in used]
+        if not all(isinstance(value, str) for value in values):
+            return False
+        replacements = [
+            (_sentinel(variable).encode(), value.encode())
+            for variable, value in zip(used, values)
+        ]
+
+        roots = {_PROJECT_ROOT: path, _PACKAGE_ROOT: target_dir}
+        for info in bundle.infolist():
+            root, _, name = info.filename.partition("/")
+            if info.is_dir():
+                (roots[root] / name).mkdir(parents=True, exist_ok=True)
+                continue
+            data = bundle.read(info)
+            for sentinel, value in replacements:
+                data = data.replace(sentinel, value)
+            (roots[root] / name).write_bytes(data)
+    return True
+
+
+if __name__ == "__main__":
+    print(f"Wrote {build_template_bundle()}")
@@ -1,10 +1,8 @@
 import click
-from . import create_project, update_pyproject_settings, check_package_name, ensure_poetry_installed, check_docker_available
+from . import create_project, check_package_name, ensure_poetry_installed, check_docker_available, load_pyproject
 from pathlib import Path
-from packaging.version import parse
-import subprocess
-import toml
 import os
+import re
 from .utils import format_tool_name
 
 
@@ -95,6 +93,8 @@ def create_mmcp(
     if version is None:
         version = click.prompt("Project version", default="0.1.0", type=str)
         assert isinstance(version, str)
+        from packaging.version import parse
+
         try:
             parse(version)  # Validate semver format
         except Exception:
@@ -121,7 +121,6 @@ def create_mmcp(
     project_path = project_path.resolve()
 
     create_project(project_path, name, description, version, claudeapp, with_examples)
-    update_pyproject_settings(project_path, version, description)
 
     click.echo("\n✅ Project created successfully!")
     click.echo(f"Project directory: {project_path}")
@@ -229,37 +228,54 @@ class {name}Tool(BaseTool):
         if not init_file.exists():
             init_file.write_text("from . import core\n\n__all__ = ['core']\n")
 
-        init_content = init_file.read_text()
-        if f"from . import {name}" not in init_content:
-            lines = init_content.splitlines()
-            lines.insert(1, f"from . import {name}")
-            for i, line in enumerate(lines):
-                if "__all__" in line:
-                    lines[i] = line.replace("]", f", '{name}']")
-                    break
-            init_file.write_text("\n".join(lines) + "\n")
+        data = init_file.read_bytes()
+        import_line = f"from . import {name}\n".encode()
+        if not re.search(rb"^" + re.escape(import_line.rstrip()) + rb"$", data, re.M):
+            if data and not data.endswith(b"\n"):
+                data += b"\n"
+            # Add the import after the first line
+            first_line_end = data.find(b"\n") + 1
+            data = data[:first_line_end] + import_line + data[first_line_end:]
+
+            # Append the tool to a single-line __all__
+            start = data.find(b"__all__")
+            if start != -1:
+                start = data.rfind(b"\n", 0, start) + 1
+                end = data.find(b"\n", start)
+                line = data[start:end]
+                entry = f"'{name}'".encode()
+                if b"[]" in line:
+                    line = line.replace(b"[]", b"[" + entry + b"]")
+                else:
+                    line = line.replace(b"]", b", " + entry + b"]")
+                data = data[:start] + line + data[end:]
+            init_file.write_bytes(data)
 
         # Update server.py to register the new tool
         server_file = path / "src" / path.name / "server.py"
+        registered = False
         if server_file.exists():
-            content = server_file.read_text()
-            lines = content.splitlines()
-            
-            for i, line in enumerate(lines):
-                if "def post_init():" in line:
-                    j = i + 1
-                    while j < len(lines) and (lines[j].strip().startswith('#') or not lines[j].strip()):
-                        j += 1
-                    lines.insert(j, f"    from .tools.{name} import {name}Tool")
-                    lines.insert(j + 1, f"    tool_service.register_tool({name}Tool())")
-                    break
-            
-            server_file.write_text("\n".join(lines))
+            # Insert the registration right after the post_init() signature
+            data = server_file.read_bytes()
+            start = data.find(b"def post_init():")
+            if start != -1:
+                registration = (
+                    f"    from .tools.{name} import {name}Tool\n"
+                    f"    tool_service.register_tool({name}Tool())\n"
+                ).encode()
+                line_end = data.find(b"\n", start) + 1
+                if not line_end:
+                    # The signature is the last line and has no newline
+                    line_end = len(data)
+                    registration = b"\n" + registration
+                server_file.write_bytes(data[:line_end] + registration + data[line_end:])
+                registered = True
+
+        if registered:
             click.echo(f"✅ Tool registered in server.py")
             click.echo(f"✅ Please confirm the tool is registered.")
-            
         else:
-            click.echo("⚠️ Warning: Could not find server.py to register the tool.")
+            click.echo("⚠️ Warning: Could not find post_init() in server.py to register the tool.")
             click.echo(f"Please manually add the following to your post_init() function:")
             click.echo(f"    from .tools.{name} import {name}Tool")
             click.echo(f"    tool_service.register_tool({name}Tool())")
@@ -312,9 +328,7 @@ def server(path: Path, port: int, host: str, reload: bool):
             click.echo("❌ Error: No pyproject.toml found. Are you in an MCP project directory?", err=True)
             return 1
 
-        with open(pyproject_path) as f:
-            pyproject = toml.load(f)
-            project_name = pyproject["tool"]["poetry"]["name"]
+        project_name = load_pyproject(pyproject_path).name
 
         click.echo(f"Starting {project_name} server on {host}:{port}...")
         
@@ -322,6 +336,8 @@ def server(path: Path, port: int, host: str, reload: bool):
         if reload:
             cmd.append("--reload")
         
+        import subprocess
+
         env = os.environ.copy()
         env["PORT"] = str(port)
         env["HOST"] = host
@@ -1,8 +1,13 @@
+import re
+
+# Anything that is not a (Unicode) letter or digit separates words in a tool name
+_TOOL_NAME_SEPARATOR_RE = re.compile(r"[\W_]+")
+
+
 def format_tool_name(name: str) -> str:
     """Format tool name to follow Python PascalCase naming conventions."""
-    formatted = name.replace(' ', '_').replace('-', '_')
-    formatted = ''.join(word.capitalize() for word in formatted.split('_'))
-    formatted = ''.join(c for c in formatted if c.isalnum())
+    parts = _TOOL_NAME_SEPARATOR_RE.split(name)
+    formatted = ''.join(part[:1].upper() + part[1:] for part in parts if part)
     if formatted and not formatted[0].isalpha():
         formatted = 'Tool' + formatted
     return formatted